@@ -5,11 +5,16 @@
 # restriction, subject to the conditions in the full MIT License.
 # The Software is provided "as is", without warranty of any kind.
 
+import contextlib
 import datetime
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 
 from app import models, logger, config
 from app.services.content_extractor import ContentExtractor
@@ -17,6 +22,9 @@ from app.services.model_adapters import PageModelAdapter, SliceModelAdapter, Ima
 
 start_dt = datetime.datetime.now()
 
+# Thread pool shared by all the requests to encode the screenshots
+image_executor = ThreadPoolExecutor(max_workers=config.THREADS, thread_name_prefix="image-encoder")
+
 ##
 # Start FastAPI app
 ##
@@ -39,6 +47,136 @@ api.add_middleware(
 )
 
 
+##
+# Helpers
+##
+def extract_pages_model(
+        content_extractor: ContentExtractor,
+        page_model_adapter: PageModelAdapter,
+        first_page: int = 1,
+        last_page: int | None = None,
+) -> list[models.Page]:
+    """
+    Extract the models of a range of pages. Slices are numbered across the whole range.
+
+    Args:
+        content_extractor: The content extractor of the document.
+        page_model_adapter: The adapter for the page model.
+        first_page: The first page to extract.
+        last_page: The last page to extract. If None, all pages are extracted.
+
+    Returns:
+        The models of the extracted pages, unprocessable pages being skipped.
+    """
+    if not last_page:
+        last_page = content_extractor.get_page_count()
+
+    # Pages are stored by position, so they don't need to be extracted in order
+    # The pages generator is closed on errors too, so that no page is still being converted on return
+    pages: list[models.Page | None] = [None] * (last_page - first_page + 1)
+    with contextlib.closing(content_extractor.extract_pages(first_page, last_page)) as extracted_pages:
+        for page_num, page in extracted_pages:
+            if page:
+                pages[page_num - first_page] = page_model_adapter.get_model(page)
+    pages = [page for page in pages if page]
+
+    # Number the slices once all the pages are extracted
+    offsets = itertools.accumulate((len(page.slices) for page in pages), initial=1)
+    for page, offset in zip(pages, offsets):
+        for slice_num, slice_ in enumerate(page.slices, start=offset):
+            slice_.slice_num = slice_num
+
+    return pages
+
+
+def iter_pages_model(
+        content_extractor: ContentExtractor,
+        page_model_adapter: PageModelAdapter,
+        first_page: int = 1,
+        last_page: int | None = None,
+) -> Generator[models.Page, None, None]:
+    """
+    Extract the models of a range of pages one at a time. Slices are numbered across the whole range.
+
+    Args:
+        content_extractor: The content extractor of the document.
+        page_model_adapter: The adapter for the page model.
+        first_page: The first page to extract.
+        last_page: The last page to extract. If None, all pages are extracted.
+
+    Yields:
+        The models of the extracted pages, unprocessable pages being skipped.
+    """
+    # The pages generator is closed on errors too, so that no page is still being converted on return
+    slice_num = 1
+    with contextlib.closing(content_extractor.extract_pages(first_page, last_page)) as extracted_pages:
+        for _, page in extracted_pages:
+            if not page:
+                continue
+            page_model = page_model_adapter.get_model(page)
+            for slice_ in page_model.slices:
+                slice_.slice_num = slice_num
+                slice_num += 1
+            yield page_model
+
+
+def read_pdf_file(file: UploadFile) -> bytes:
+    """
+    Read the content of an uploaded PDF document.
+
+    Args:
+        file: The uploaded file.
+
+    Returns:
+        The content of the file.
+
+    Raises:
+        HTTPException: If the file is not a PDF document or is empty.
+    """
+    # Check if the file is a PDF
+    if file.content_type != "application/pdf":
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Only PDF files are supported.",
+        )
+
+    # Read the file content
+    file_bytes = file.file.read()
+    if not file_bytes:
+        raise HTTPException(
+            status_code=400,
+            detail="Empty file. Please upload a valid PDF document.",
+        )
+
+    return file_bytes
+
+
+def get_page_model_adapter(
+        *,
+        extract_pages_screenshot: bool,
+        extract_slices_screenshot: bool,
+        image_format: models.ImageFormat,
+        image_quality: int,
+) -> PageModelAdapter:
+    """
+    Initialize the model adapters and return the page model adapter.
+    """
+    image_model_adapter = ImageModelAdapter(
+        image_format=image_format,
+        image_quality=image_quality,
+        executor=image_executor
+    )
+    slice_model_adapter = SliceModelAdapter(
+        image_model_adapter=image_model_adapter,
+        extract_screenshot=extract_slices_screenshot
+    )
+    return PageModelAdapter(
+        slice_model_adapter=slice_model_adapter,
+        image_model_adapter=image_model_adapter,
+        extract_screenshot=extract_pages_screenshot
+    )
+
+
 ##
 # Routes
 ##
@@ -82,58 +220,93 @@ async def process_document(
     """
     Extract slices from a PDF document.
     """
-    # Check if the file is a PDF
-    if file.content_type != "application/pdf":
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file type. Only PDF files are supported.",
-        )
+    file_bytes = read_pdf_file(file)
 
-    # Read the file content
-    file_bytes = file.file.read()
-    if not file_bytes:
-        raise HTTPException(
-            status_code=400,
-            detail="Empty file. Please upload a valid PDF document.",
-        )
+    # Initialize the content extractor
+    content_extractor = ContentExtractor(
+        ocr_pipeline=ocr_pipeline,
+        bytes_or_path=file_bytes,
+        filename=file.filename,
+        images_scale=image_scale,
+        page_concurrency=config.PAGE_CONCURRENCY,
+        cache_dir=config.CACHE_DIR,
+    )
 
     try:
-        # Initialize the content extractor
-        content_extractor = ContentExtractor(
-            ocr_pipeline=ocr_pipeline,
-            bytes_or_path=file_bytes,
-            filename=file.filename,
-            images_scale=image_scale,
-        )
-
         # Initialize the model adapters
-        image_model_adapter = ImageModelAdapter(
+        page_model_adapter = get_page_model_adapter(
+            extract_pages_screenshot=extract_pages_screenshot,
+            extract_slices_screenshot=extract_slices_screenshot,
             image_format=image_format,
-            image_quality=image_quality
-        )
-        slice_model_adapter = SliceModelAdapter(
-            image_model_adapter=image_model_adapter,
-            extract_screenshot=extract_slices_screenshot
-        )
-        page_model_adapter = PageModelAdapter(
-            slice_model_adapter=slice_model_adapter,
-            image_model_adapter=image_model_adapter,
-            extract_screenshot=extract_pages_screenshot
+            image_quality=image_quality,
         )
 
         # Extract the specified range of pages from the PDF document
-        pages = []
-        for _, page in content_extractor.extract_pages(first_page, last_page):
-            if page:
-                page_model = page_model_adapter.get_model(page)
-                pages.append(page_model)
-
         return models.ProcessResponse(
             document=file.filename,
             size=file.size,
             content_type=file.content_type,
-            pages=pages,
+            pages=extract_pages_model(content_extractor, page_model_adapter, first_page, last_page),
         )
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}") from e
+    finally:
+        content_extractor.close()
+
+
+@api.post("/process/stream")
+async def process_document_stream(
+        file: UploadFile = File(..., description="The PDF document to process"),
+        ocr_pipeline: models.OcrPipeline = Form(default=models.OcrPipeline.HYBRID,
+                                                description="The OCR pipeline to use"),
+        first_page: int = Form(default=1, description="The first page number to process"),
+        last_page: int | None = Form(default=None, description="The last page number to process"),
+        extract_pages_screenshot: bool = Form(default=True,
+                                              description="Whether to extract the screenshot of the pages"),
+        extract_slices_screenshot: bool = Form(default=True,
+                                               description="Whether to extract the screenshot of the slices"),
+        image_format: models.ImageFormat = Form(default=models.ImageFormat.WEBP,
+                                                description="The image format for the screenshots"),
+        image_quality: int = Form(default=80, description="The quality of the image (0-100)"),
+        image_scale: float = Form(default=2.0, description="The scale factor for the images"),
+) -> StreamingResponse:
+    """
+    Extract slices from a PDF document, streaming the pages as newline-delimited JSON (one Page per line).
+    If the processing fails, the last line is an error object with a "detail" field instead of a Page.
+    """
+    file_bytes = read_pdf_file(file)
+
+    # Initialize the content extractor and the model adapters
+    content_extractor = ContentExtractor(
+        ocr_pipeline=ocr_pipeline,
+        bytes_or_path=file_bytes,
+        filename=file.filename,
+        images_scale=image_scale,
+        page_concurrency=config.PAGE_CONCURRENCY,
+        cache_dir=config.CACHE_DIR,
+    )
+    page_model_adapter = get_page_model_adapter(
+        extract_pages_screenshot=extract_pages_screenshot,
+        extract_slices_screenshot=extract_slices_screenshot,
+        image_format=image_format,
+        image_quality=image_quality,
+    )
+
+    def iter_lines() -> Generator[str, None, None]:
+        try:
+            # The pages are closed before the extractor, also when the client disconnects
+            with contextlib.closing(
+                    iter_pages_model(content_extractor, page_model_adapter, first_page, last_page)
+            ) as pages:
+                for page in pages:
+                    yield page.model_dump_json() + "\n"
+        except Exception as e:
+            # The response headers are already sent, so the error is reported as the last line of the stream
+            logger.error(f"Error processing file: {str(e)}")
+            yield json.dumps({"detail": f"Error processing file: {str(e)}"}) + "\n"
+            raise
+        finally:
+            content_extractor.close()
+
+    return StreamingResponse(iter_lines(), media_type="application/x-ndjson")
@@ -20,6 +20,8 @@ if os.path.isfile(_config_dir / '.env.local'):
 # Define constants for the application
 ENV: str = os.getenv("ENV", "development")
 THREADS: int = int(os.getenv("THREADS", 4))
+PAGE_CONCURRENCY: int = int(os.getenv("PAGE_CONCURRENCY", 1))
+CACHE_DIR: str | None = os.getenv("CACHE_DIR")
 VERSION: str = os.getenv("VERSION")
 BUILD_ID: str = os.getenv("BUILD_ID")
 COMMIT_SHA: str = os.getenv("COMMIT_SHA")
@@ -5,15 +5,25 @@
 #  restriction, subject to the conditions in the full MIT License.
 #  The Software is provided "as is", without warranty of any kind.
 
+import contextlib
+import hashlib
+import mmap
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from io import BytesIO
 from pathlib import Path
 from typing import Generator
 
 import pymupdf
-from docling.datamodel.base_models import DocumentStream
+from docling.datamodel.base_models import DocumentStream, ConversionStatus
+from docling_core.types.doc.document import DoclingDocument
 
 from app import logger, models
-from app.services.dl_converter import get_dl_converter, DocumentConverter
+from app.services.dl_converter import get_dl_converter
 from .page_extractor import PageExtractor
 
 
@@ -28,7 +38,9 @@ class ContentExtractor:
             *,
             ocr_pipeline: models.OcrPipeline = models.OcrPipeline.HYBRID,
             filename: str = "file.pdf",
-            images_scale: float = 3.0
+            images_scale: float = 3.0,
+            page_concurrency: int = 1,
+            cache_dir: str | Path | None = None
     ):
         """
         Initialize the PDF content extractor.
@@ -38,13 +50,36 @@ class ContentExtractor:
             ocr_pipeline: The OCR pipeline to use.
             filename: The name of the PDF file.
             images_scale: The scale factor for images.
+            page_concurrency: The maximum number of pages converted concurrently.
+            cache_dir: The directory where converted pages are cached. If None, pages are not cached.
         """
         self._logger = logger.getChild(__name__)
+        self._pdf_document: pymupdf.Document | None = None
+        self._pdf_document_lock = threading.Lock()
         self.bytes_or_path = bytes_or_path
         self.ocr_pipeline = ocr_pipeline
         self.filename = filename
         self.images_scale = images_scale
-        self._dl_converters = self._load_dl_converters()
+        self.page_concurrency = page_concurrency
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Release the document opened to probe the text layer, if any.
+
+        Pages still being converted may use the document, so the generators returned by extract_pages()
+        should be closed first, which waits for their conversions to complete.
+        """
+        # PyMuPDF documents are not thread-safe
+        with self._pdf_document_lock:
+            if self._pdf_document is not None:
+                self._pdf_document.close()
+                self._pdf_document = None
 
     def extract_pages(
             self,
@@ -62,14 +97,28 @@ class ContentExtractor:
             A tuple containing the page number and the page with slices extracted from the document.
         """
         if not last_page:
-            last_page = self._count_pdf_pages(self.bytes_or_path)
+            last_page = self.get_page_count()
 
         self._logger.debug(f"Processing page range %s to %s", first_page, last_page)
 
-        # noinspection PyTypeChecker
-        for page_num in range(first_page, last_page + 1):
-            page = self.extract_page(page_num=page_num)
-            yield page_num, page
+        # Pages are converted in the background, concurrently if enabled, and yielded in order. Keeping two
+        # pages per worker in flight lets the next pages convert while the caller processes the current one.
+        workers = max(self.page_concurrency, 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            try:
+                # noinspection PyTypeChecker
+                for page_num in range(first_page, last_page + 1):
+                    in_flight.append((page_num, executor.submit(self.extract_page, page_num=page_num)))
+                    if len(in_flight) >= workers * 2:
+                        done_page_num, future = in_flight.popleft()
+                        yield done_page_num, future.result()
+                while in_flight:
+                    done_page_num, future = in_flight.popleft()
+                    yield done_page_num, future.result()
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
 
     def extract_page(self, page_num: int, first_slice_num: int = 1) -> PageExtractor | None:
         """
@@ -82,36 +131,131 @@ class ContentExtractor:
         Returns:
             The page with slices extracted from the document.
         """
-        for converter in self._dl_converters:
+        converters_full_ocr = self._get_dl_converters_full_ocr()
+
+        # Pages without a text layer only get text from OCR, so the full OCR converter is used directly
+        if len(converters_full_ocr) > 1 and not self._has_text_layer(page_num):
+            self._logger.debug("Page %s has no text layer, using full OCR", page_num)
+            converters_full_ocr = converters_full_ocr[-1:]
+
+        for converter_idx, full_ocr in enumerate(converters_full_ocr):
             # Convert the page to a Docling document
             try:
-                result = converter.convert(
-                    source=self._get_dl_source(),
-                    page_range=(page_num, page_num),
-                    raises_on_error=False,
-                )
+                dl_document = self._convert_page(page_num, full_ocr=full_ocr)
             except Exception as e:
                 self._logger.error("Failed to convert page %s: %s", page_num, e)
                 continue
 
-            if not result.document:
+            if not dl_document:
                 self._logger.warning("Failed to convert page %s to Docling document", page_num)
                 continue
 
             # Extract the page using the converter
-            page = PageExtractor(result.document, page_num=page_num, first_slice_num=first_slice_num)
+            page = PageExtractor(dl_document, page_num=page_num, first_slice_num=first_slice_num)
 
             # Returns the page is it has text slices or is the last converter
-            if page.has_text_slices() or converter == self._dl_converters[-1]:
+            if page.has_text_slices() or converter_idx == len(converters_full_ocr) - 1:
                 return page
 
         return None
 
-    def _get_dl_source(self):
+    def _has_text_layer(self, page_num: int) -> bool:
+        """
+        Verifies if a page has an embedded text layer, reading the PDF with PyMuPDF (no OCR).
+
+        Args:
+            page_num: The page number to verify.
+
+        Returns:
+            True if the page contains any embedded text or if it could not be read, False otherwise.
+        """
+        try:
+            # PyMuPDF documents are not thread-safe
+            with self._pdf_document_lock:
+                if self._pdf_document is None:
+                    if isinstance(self.bytes_or_path, bytes):
+                        self._pdf_document = pymupdf.open(stream=self.bytes_or_path, filetype="pdf")
+                    else:
+                        self._pdf_document = pymupdf.open(filename=self.bytes_or_path)
+                return bool(self._pdf_document[page_num - 1].get_text().strip())
+        except Exception as e:
+            self._logger.warning("Failed to read the text layer of page %s: %s", page_num, e)
+            return True
+
+    def _convert_page(self, page_num: int, *, full_ocr: bool) -> DoclingDocument | None:
+        """
+        Convert a page to a Docling document, reusing the cached conversion if any. The document
+        converter is only loaded when the page needs to be converted.
+
+        Args:
+            page_num: The page number to convert.
+            full_ocr: Whether to use the full OCR converter.
+
+        Returns:
+            The Docling document of the page or None if the conversion failed.
+        """
+        cache_file = None
+        if self.cache_dir:
+            digest = self._pdf_meta[0]
+            cache_file = self.cache_dir / (
+                f"{digest}-{page_num}-{self.images_scale}-{'full' if full_ocr else 'fast'}.json"
+            )
+            if cache_file.is_file():
+                try:
+                    return DoclingDocument.model_validate_json(cache_file.read_bytes())
+                except ValueError as e:
+                    self._logger.warning("Ignoring invalid cached conversion %s: %s", cache_file, e)
+
+        converter = get_dl_converter(full_ocr=full_ocr, images_scale=self.images_scale)
+        result = converter.convert(
+            source=self._get_dl_source(),
+            page_range=(page_num, page_num),
+            raises_on_error=False,
+        )
+
+        # Only successful conversions are cached (failed ones still come with an empty document). The
+        # conversion is written to a temporary file first so concurrent readers never see a partial file.
+        if cache_file and result.status == ConversionStatus.SUCCESS:
+            tmp_cache_file = cache_file.with_name(f"{cache_file.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                tmp_cache_file.write_text(result.document.model_dump_json(), encoding="utf-8")
+                os.replace(tmp_cache_file, cache_file)
+            except OSError as e:
+                self._logger.warning("Failed to cache the conversion of page %s: %s", page_num, e)
+                with contextlib.suppress(OSError):
+                    tmp_cache_file.unlink(missing_ok=True)
+
+        return result.document
+
+    def get_page_count(self) -> int:
+        """
+        Returns the number of pages in the PDF document.
+        """
+        return self._pdf_meta[1]
+
+    @cached_property
+    def _pdf_meta(self) -> tuple[str, int]:
+        """
+        Returns the SHA-256 digest and the number of pages of the PDF document.
+
+        Both are computed once per extractor. Files are hashed through a read-only memory map, and the pages
+        are counted by PyMuPDF, which resolves the page tree through the cross-reference data.
+        """
+        if isinstance(self.bytes_or_path, bytes):
+            digest = hashlib.sha256(self.bytes_or_path).hexdigest()
+        else:
+            with (open(self.bytes_or_path, 'rb') as file,
+                  mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer):
+                digest = hashlib.sha256(buffer).hexdigest()
+
+        return digest, self._count_pdf_pages(self.bytes_or_path)
+
+    def _get_dl_source(self) -> DocumentStream | str | Path:
         """
         Get the source for the document converter.
         """
-        # If the source is bytes, create a BytesIO stream
+        # If the source is bytes, create a BytesIO stream (which shares the bytes until written to). The
+        # filename lets Docling detect the format from its extension when the content does not start with %PDF.
         if isinstance(self.bytes_or_path, bytes):
             # noinspection PyTypeChecker
             return DocumentStream(name=self.filename, stream=BytesIO(self.bytes_or_path))
@@ -119,20 +263,16 @@ class ContentExtractor:
         # If the source is a path, use it directly
         return self.bytes_or_path
 
-    def _load_dl_converters(self) -> list[DocumentConverter]:
+    def _get_dl_converters_full_ocr(self) -> list[bool]:
         """
-        Get the document converter with the specified options in a thread-safe manner.
+        Returns whether each document converter of the OCR pipeline uses full OCR, in the order they are tried.
         """
-        converters = []
+        converters_full_ocr = []
         if self.ocr_pipeline in (models.OcrPipeline.HYBRID, models.OcrPipeline.FAST):
-            converters.append(
-                get_dl_converter(full_ocr=False, images_scale=self.images_scale)
-            )
+            converters_full_ocr.append(False)
         if self.ocr_pipeline in (models.OcrPipeline.HYBRID, models.OcrPipeline.FULL):
-            converters.append(
-                get_dl_converter(full_ocr=True, images_scale=self.images_scale)
-            )
-        return converters
+            converters_full_ocr.append(True)
+        return converters_full_ocr
 
     @staticmethod
     def _count_pdf_pages(bytes_or_path: bytes | str | Path) -> int:
@@ -148,7 +288,7 @@ class ContentExtractor:
         if isinstance(bytes_or_path, (str, Path)):
             handler = pymupdf.open(filename=bytes_or_path)
         else:
-            handler = pymupdf.open(stream=bytes_or_path)
+            handler = pymupdf.open(stream=bytes_or_path, filetype="pdf")
 
         with handler as pdf:
-            return len(pdf)
+            return pdf.page_count
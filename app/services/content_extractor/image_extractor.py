@@ -5,11 +5,13 @@
 #  restriction, subject to the conditions in the full MIT License.
 #  The Software is provided "as is", without warranty of any kind.
 
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
 from io import BytesIO
 
 import PIL.Image
 
-from app import logger, models
+from app import models, config
 
 
 class ImageExtractor:
@@ -17,6 +19,8 @@ class ImageExtractor:
     A class to extract image data from a PIL Image object.
     """
 
+    __slots__ = ('pil_image',)
+
     def __init__(self, pil_image: PIL.Image.Image):
         """
         Initializes the ImageExtractor with a PIL Image object.
@@ -25,7 +29,6 @@ class ImageExtractor:
             pil_image: The PIL Image object to extract data from.
         """
         self.pil_image = pil_image
-        self._logger = logger.getChild(__name__)
 
     def get_width(self) -> int:
         """
@@ -54,7 +57,6 @@ class ImageExtractor:
         Returns:
             The image data as bytes.
         """
-        self._logger.debug("Getting image data")
         webp_bytes = BytesIO()
         self.pil_image.save(
             webp_bytes,
@@ -62,3 +64,41 @@ class ImageExtractor:
             quality=image_quality
         )
         return webp_bytes.getvalue()
+
+    @staticmethod
+    def encode_many(
+            pil_images: list[PIL.Image.Image],
+            image_format: models.ImageFormat = models.ImageFormat.WEBP,
+            image_quality: int = 80,
+            executor: Executor | None = None
+    ) -> list[bytes]:
+        """
+        Returns the data of several images in the specified format and quality.
+
+        Images are encoded concurrently (Pillow releases the GIL while encoding).
+
+        Args:
+            pil_images: The PIL Image objects to encode.
+            image_format: The format of the images (default: WEBP).
+            image_quality: The quality of the images (1-100, default: 80).
+            executor: The executor to encode the images with (default: a thread pool created for the call).
+
+        Returns:
+            The data of each image as bytes, in the same order as the images.
+        """
+        encode = partial(ImageExtractor._encode, image_format=image_format, image_quality=image_quality)
+        if len(pil_images) <= 1:
+            return [encode(pil_image) for pil_image in pil_images]
+
+        if executor:
+            return list(executor.map(encode, pil_images))
+
+        with ThreadPoolExecutor(max_workers=min(len(pil_images), config.THREADS)) as executor:
+            return list(executor.map(encode, pil_images))
+
+    @staticmethod
+    def _encode(pil_image: PIL.Image.Image, *, image_format: models.ImageFormat, image_quality: int) -> bytes:
+        """
+        Encodes an image in the specified format and quality.
+        """
+        return ImageExtractor(pil_image).get_data(image_format, image_quality)
@@ -7,18 +7,36 @@
 
 from typing import Generator
 
-from docling_core.types.doc.document import TextItem, TableItem, DoclingDocument, PictureItem
+from docling_core.types.doc.document import TextItem, TableItem, DoclingDocument, PictureItem, NodeItem
 
 from app import logger
 from .image_extractor import ImageExtractor
 from .slice_extractor import SliceExtractor
 
+_logger = logger.getChild(__name__)
+
+# Types of the Docling items extracted as slices
+_SLICE_TYPES = (TextItem, TableItem, PictureItem)
+
+
+def _get_subclasses(cls: type) -> set[type]:
+    """
+    Returns a class and all its subclasses.
+    """
+    return {cls}.union(*(_get_subclasses(subclass) for subclass in cls.__subclasses__()))
+
+
+# Exact types of the slice items known at import, checked before falling back to isinstance()
+_SLICE_EXACT_TYPES = frozenset().union(*(_get_subclasses(cls) for cls in _SLICE_TYPES))
+
 
 class PageExtractor:
     """
     PageExtractor is responsible for extracting information from a page in a Docling document.
     """
 
+    __slots__ = ('dl_document', 'page_num', 'page', 'first_slice_num', '_items', '_slices')
+
     def __init__(self, dl_document: DoclingDocument, *, page_num: int = 0, first_slice_num: int = 1):
         """
         Initializes the PageExtractor with a Docling document and page number.
@@ -34,7 +52,12 @@ class PageExtractor:
         self.page_num = page_num
         self.page = dl_document.pages[page_num]
         self.first_slice_num = first_slice_num
-        self._logger = logger.getChild(__name__)
+        self._items: list[tuple[NodeItem, int]] = [
+            (dl_item, level)
+            for dl_item, level in dl_document.iterate_items(page_no=page_num)
+            if type(dl_item) in _SLICE_EXACT_TYPES or isinstance(dl_item, _SLICE_TYPES)
+        ]
+        self._slices: list[tuple[int, SliceExtractor]] | None = None
 
     def get_width(self) -> float:
         """
@@ -55,24 +78,19 @@ class PageExtractor:
         Returns:
             The screenshot as an ImageExtractor object or None if not applicable.
         """
-        self._logger.debug("Getting screenshot for page %s", self.page_num)
+        _logger.debug("Getting screenshot for page %s", self.page_num)
         if not self.page.image or not self.page.image.pil_image:
             return None
         return ImageExtractor(self.page.image.pil_image)
 
     def has_text_slices(self) -> bool:
         """
-        Verifies if the page contains any text slices.
+        Verifies if the page contains any text slices. Text items with an empty text are not counted.
 
         Returns:
             bool: True if the page contains text slices, False otherwise.
         """
-        for dl_item, level in self.dl_document.iterate_items(page_no=self.page_num):
-            if not isinstance(dl_item, (TextItem, TableItem, PictureItem)):
-                continue
-            if isinstance(dl_item, TextItem) and dl_item.text:
-                return True
-        return False
+        return any(isinstance(dl_item, TextItem) and dl_item.text for dl_item, _ in self._items)
 
     def get_slices(self) -> Generator[tuple[int, SliceExtractor], None, None]:
         """
@@ -81,16 +99,21 @@ class PageExtractor:
         Returns:
             A generator yielding SliceExtractor objects for each slice.
         """
+        yield from self._get_slices()
 
-        slice_num = self.first_slice_num
-        self._logger.debug("Getting slices for page %s", self.page_num)
-        for dl_item, level in self.dl_document.iterate_items(page_no=self.page_num):
-            if not isinstance(dl_item, (TextItem, TableItem, PictureItem)):
-                continue
-            slice_extractor = SliceExtractor(
-                dl_document=self.dl_document,
-                dl_item=dl_item,
-                level=level,
-                slice_num=slice_num
-            )
-            yield slice_num, slice_extractor
+    def _get_slices(self) -> list[tuple[int, SliceExtractor]]:
+        """
+        Returns the numbered slices of the page, built once and kept for the next calls.
+        """
+        if self._slices is None:
+            _logger.debug("Getting slices for page %s", self.page_num)
+            self._slices = [
+                (slice_num, SliceExtractor(
+                    dl_document=self.dl_document,
+                    dl_item=dl_item,
+                    level=level,
+                    slice_num=slice_num
+                ))
+                for slice_num, (dl_item, level) in enumerate(self._items, start=self.first_slice_num)
+            ]
+        return self._slices
@@ -5,13 +5,11 @@
 #  restriction, subject to the conditions in the full MIT License.
 #  The Software is provided "as is", without warranty of any kind.
 
-import re
-
 from docling_core.types.doc import DocItemLabel, CoordOrigin
 from docling_core.types.doc.document import DocItem, ProvenanceItem
 from docling_core.types.doc.document import TextItem, TableItem, DoclingDocument, PictureItem, FormulaItem, CodeItem
 
-from app import logger
+from app.utils.text_cleanup import clean_pdf_glyphs
 from .image_extractor import ImageExtractor
 
 
@@ -20,6 +18,8 @@ class SlicePositionExtractor:
     SlicePositionExtractor is responsible for extracting position information from a slice in a Docling document.
     """
 
+    __slots__ = ('prov',)
+
     def __init__(self, prov: ProvenanceItem):
         """
         Initializes the SlicePositionExtractor with a Docling document and item.
@@ -35,19 +35,29 @@ class SlicePositionExtractor:
 
     def get_top(self, bbox_precision: int = 2) -> float:
         """Returns the top coordinate of the bounding box."""
-        return round(self.prov.bbox.t, bbox_precision)
+        return self.get_bbox(bbox_precision)[0]
 
     def get_right(self, bbox_precision: int = 2) -> float:
         """Returns the right coordinate of the bounding box."""
-        return round(self.prov.bbox.r, bbox_precision)
+        return self.get_bbox(bbox_precision)[1]
 
     def get_bottom(self, bbox_precision: int = 2) -> float:
         """Returns the bottom coordinate of the bounding box."""
-        return round(self.prov.bbox.b, bbox_precision)
+        return self.get_bbox(bbox_precision)[2]
 
     def get_left(self, bbox_precision: int = 2) -> float:
         """Returns the left coordinate of the bounding box."""
-        return round(self.prov.bbox.l, bbox_precision)
+        return self.get_bbox(bbox_precision)[3]
+
+    def get_bbox(self, bbox_precision: int = 2) -> tuple[float, float, float, float]:
+        """Returns the top, right, bottom and left coordinates of the bounding box, rounded together."""
+        bbox = self.prov.bbox
+        return (
+            round(bbox.t, bbox_precision),
+            round(bbox.r, bbox_precision),
+            round(bbox.b, bbox_precision),
+            round(bbox.l, bbox_precision),
+        )
 
     def get_coord_origin(self) -> CoordOrigin:
         """Returns the coordinate origin of the bounding box."""
@@ -59,7 +69,7 @@ class SliceExtractor:
     SliceExtractor is responsible for extracting information from a slice in a Docling document.
     """
 
-    glyph_pattern = re.compile(r'(?i)glyph<(?:c=\d+,font=/[A-Z0-9]+\+[A-Za-z0-9-]+|\d+)>')
+    __slots__ = ('dl_document', 'dl_item', 'slice_num', 'level')
 
     def __init__(
             self,
@@ -82,7 +92,6 @@ class SliceExtractor:
         self.dl_item = dl_item
         self.slice_num = slice_num
         self.level = level
-        self._logger = logger.getChild(__name__)
 
     def get_ref(self) -> str:
         """
@@ -111,27 +120,33 @@ class SliceExtractor:
         """
         return self.dl_item.label
 
-    def get_content_text(self) -> str | None:
+    def get_content_text(self, *, clean: bool = True) -> str | None:
         """
         Returns the text content of the item.
 
+        Args:
+            clean: Whether to remove the PDF tags from the text.
+
         Returns:
             The text content as a string or None if not applicable.
         """
-        self._logger.debug("Extracting content text for %s", self.dl_item.self_ref)
         if not isinstance(self.dl_item, TextItem):
             return None
 
         text = self.dl_item.text
         if not text:
             return None
-        text = self._clean_pdf_glyphs(text)
+        if clean:
+            text = clean_pdf_glyphs(text)
         return text
 
-    def get_caption_text(self) -> str | None:
+    def get_caption_text(self, *, clean: bool = True) -> str | None:
         """
         Returns the caption text of the item.
 
+        Args:
+            clean: Whether to remove the PDF tags from the text.
+
         Returns:
             The caption text as a string or None if not applicable.
         """
@@ -141,42 +156,50 @@ class SliceExtractor:
         text = self.dl_item.caption_text(self.dl_document)
         if not text:
             return None
-        text = self._clean_pdf_glyphs(text)
+        if clean:
+            text = clean_pdf_glyphs(text)
         return text
 
     def get_table_data(self) -> list[list[str | int | None]] | None:
         """
-        Returns the table data of the item.
+        Returns the table data of the item, read directly from the table grid.
+
+        The headers are named the way Docling names the columns of its DataFrame export: the texts of the
+        column header rows joined with a dot, or the column indexes when the table has no header row.
 
         Returns:
             The table data as a list of lists or None if not applicable.
         """
-        self._logger.debug("Extracting table data for %s", self.dl_item.self_ref)
         if not isinstance(self.dl_item, TableItem):
             return None
 
-        df = self.dl_item.export_to_dataframe()
-        table_data = []
-
-        # Extract headers and values
-        if headers := df.columns.tolist():
-            table_data.append(headers)
-        if values := df.values.tolist():
-            table_data.extend(values)
-
-        if not table_data:
+        table = self.dl_item.data
+        if not table.num_rows or not table.num_cols:
             return None
 
-        # Cleanup table data
-        for i, row in enumerate(table_data):
-            for j, col in enumerate(row):
-                if isinstance(col, str):
-                    clean_col = self._clean_pdf_glyphs(col)
-                    if clean_col != col:
-                        # noinspection PyTypeChecker
-                        table_data[i][j] = clean_col
+        grid = table.grid
 
-        return table_data
+        # Count how many rows are column headers
+        num_headers = 0
+        for row in grid:
+            if not any(cell.column_header for cell in row):
+                break
+            num_headers += 1
+
+        # Extract headers and values
+        if num_headers:
+            headers = [""] * table.num_cols
+            for row in grid[:num_headers]:
+                for col_idx, cell in enumerate(row):
+                    headers[col_idx] += f".{cell.text}" if headers[col_idx] else cell.text
+            headers = [clean_pdf_glyphs(header) for header in headers]
+        else:
+            headers = list(range(table.num_cols))
+
+        return [headers] + [
+            [clean_pdf_glyphs(cell.text) for cell in row]
+            for row in grid[num_headers:]
+        ]
 
     def get_positions(self) -> list[SlicePositionExtractor]:
         """
@@ -185,7 +208,6 @@ class SliceExtractor:
         Returns:
             The positions of the item as a list of Position objects.
         """
-        self._logger.debug("Extracting positions for %s", self.dl_item.self_ref)
         return [
             SlicePositionExtractor(prov)
             for prov in self.dl_item.prov
@@ -198,7 +220,6 @@ class SliceExtractor:
         Returns:
             The screenshot as an ImageExtractor object or None if not applicable.
         """
-        self._logger.debug("Extracting screenshot for %s", self.dl_item.self_ref)
         if not isinstance(self.dl_item, (PictureItem, TableItem, FormulaItem, CodeItem)):
             return None
 
@@ -208,18 +229,3 @@ class SliceExtractor:
             return None
 
         return ImageExtractor(item_image)
-
-    def _clean_pdf_glyphs(self, text: str) -> str:
-        """
-        Remove PDF tags from the text.
-
-        Args:
-            text: The text to clean.
-
-        Returns:
-            The cleaned text without PDF tags.
-        """
-        cleaned_text = self.glyph_pattern.sub(' ', text)  # Replace all matches with empty string
-        cleaned_text = re.sub(r'[ \t]+', ' ', cleaned_text)  # Remove extra spaces
-        cleaned_text = cleaned_text.strip()
-        return cleaned_text
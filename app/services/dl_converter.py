@@ -5,6 +5,8 @@
 #  restriction, subject to the conditions in the full MIT License.
 #  The Software is provided "as is", without warranty of any kind.
 
+import threading
+import weakref
 from functools import lru_cache
 
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
@@ -25,8 +27,11 @@ _logger = logger.getChild(__name__)
 
 EASY_OCR_LANGUAGES = ["fr", "de", "es", "en"]
 
+# One lock per set of options, held while the converter is loaded (the locks are dropped once unused)
+_dl_converter_locks: weakref.WeakValueDictionary[tuple, threading.Lock] = weakref.WeakValueDictionary()
+_dl_converter_locks_lock = threading.Lock()
+
 
-@lru_cache(maxsize=8)
 def get_dl_converter(
         *,
         full_ocr: bool = False,
@@ -38,6 +43,45 @@ def get_dl_converter(
     """
     Get the document converter with the specified options in a thread-safe manner.
 
+    Converters are shared by the whole process: each set of options is loaded once, even when
+    requested concurrently, without blocking the requests for converters with other options.
+
+    Args:
+        full_ocr (bool): Whether to use full OCR or not.
+        ocr_confidence_threshold (float): The confidence threshold for OCR.
+        ocr_bitmap_area_threshold (float): The bitmap area threshold for OCR.
+        images_scale (float): The scale factor for images.
+        dl_generate_images (bool): Whether to generate images or not.
+
+    Returns:
+        DocumentConverter: The document converter.
+    """
+    options = (full_ocr, ocr_confidence_threshold, ocr_bitmap_area_threshold, images_scale, dl_generate_images)
+    with _dl_converter_locks_lock:
+        options_lock = _dl_converter_locks.setdefault(options, threading.Lock())
+
+    with options_lock:
+        return _load_dl_converter(
+            full_ocr=full_ocr,
+            ocr_confidence_threshold=ocr_confidence_threshold,
+            ocr_bitmap_area_threshold=ocr_bitmap_area_threshold,
+            images_scale=images_scale,
+            dl_generate_images=dl_generate_images,
+        )
+
+
+@lru_cache(maxsize=8)
+def _load_dl_converter(
+        *,
+        full_ocr: bool,
+        ocr_confidence_threshold: float,
+        ocr_bitmap_area_threshold: float,
+        images_scale: float,
+        dl_generate_images: bool,
+) -> DocumentConverter:
+    """
+    Load the document converter with the specified options.
+
     https://docling-project.github.io/docling/examples/run_with_accelerator/
 
     Args:
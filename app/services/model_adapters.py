@@ -5,9 +5,12 @@
 #  restriction, subject to the conditions in the full MIT License.
 #  The Software is provided "as is", without warranty of any kind.
 
-import base64
+from concurrent.futures import Executor
+
+from docling_core.types.doc.document import TextItem, TableItem, PictureItem
 
 from app import models
+from app.utils.base64 import encode_to_base64
 from .content_extractor import PageExtractor, ImageExtractor, SliceExtractor, SlicePositionExtractor
 
 
@@ -45,24 +48,21 @@ class PageModelAdapter:
         Returns:
             The model of the page as a DoclingDocument object.
         """
-        page = models.Page(
+        # Extract the page screenshot if requested
+        screenshot = None
+        if self.extract_screenshot and (screenshot_extractor := extractor.get_screenshot()):
+            screenshot = self.image_model_adapter.get_model(screenshot_extractor)
+
+        return models.Page(
             page_num=extractor.page_num,
             width=extractor.get_width(),
             height=extractor.get_height(),
-            screenshot=None,
+            screenshot=screenshot,
+            slices=self.slice_model_adapter.get_models(
+                [slice_extractor for _, slice_extractor in extractor.get_slices()]
+            ),
         )
 
-        # Extract the page screenshot if requested
-        if self.extract_screenshot is not None and (screenshot := extractor.get_screenshot()):
-            page.screenshot = self.image_model_adapter.get_model(screenshot)
-
-        # Extract the slices from the page
-        for _, slice_extractor in extractor.get_slices():
-            slice_ = self.slice_model_adapter.get_model(slice_extractor)
-            page.slices.append(slice_)
-
-        return page
-
 
 class SliceModelAdapter:
     """
@@ -73,6 +73,7 @@ class SliceModelAdapter:
             self,
             *,
             extract_screenshot: bool = False,
+            clean_text: bool = True,
             position_model_adapter: 'SlicePositionModelAdapter' = None,
             image_model_adapter: 'ImageModelAdapter' = None,
     ):
@@ -81,10 +82,12 @@ class SliceModelAdapter:
 
         Args:
             extract_screenshot: Whether to extract the screenshot of the slice.
+            clean_text: Whether to remove the PDF tags from the content and caption texts.
             position_model_adapter: The adapter for the slice position model.
             image_model_adapter: The adapter for the image model.
         """
         self.extract_screenshot = extract_screenshot
+        self.clean_text = clean_text
         self.position_model_adapter = position_model_adapter or SlicePositionModelAdapter()
         self.extract_model_adapter = image_model_adapter or ImageModelAdapter()
 
@@ -95,32 +98,68 @@ class SliceModelAdapter:
         Returns:
             The slice model with data extracted from the document.
         """
+        return self.get_models([extractor])[0]
+
+    def get_models(self, extractors: list[SliceExtractor]) -> list[models.Slice]:
+        """
+        Extract the slice models from several slice extractors. The screenshots are encoded in a single batch.
+
+        Args:
+            extractors: The slice extractor objects.
+
+        Returns:
+            The slice models with data extracted from the document, in the same order as the extractors.
+        """
+        slices = [self._get_model_without_screenshot(extractor) for extractor in extractors]
+
+        # Extract the slices screenshots if requested
+        if self.extract_screenshot:
+            screenshots = [
+                (slice_, screenshot)
+                for slice_, extractor in zip(slices, extractors)
+                if (screenshot := extractor.get_screenshot())
+            ]
+            images = self.extract_model_adapter.get_models([screenshot for _, screenshot in screenshots])
+            for (slice_, _), image in zip(screenshots, images):
+                slice_.screenshot = image
+
+        return slices
+
+    def _get_model_without_screenshot(self, extractor: SliceExtractor) -> models.Slice:
+        """
+        Extract the slice model from the slice extractor, leaving out the screenshot.
+
+        Returns:
+            The slice model with data extracted from the document.
+        """
+        # Only call the getters relevant to the type of the item
+        content_text = caption_text = table_data = None
+        dl_item = extractor.dl_item
+        if isinstance(dl_item, TextItem):
+            content_text = extractor.get_content_text(clean=self.clean_text)
+        elif isinstance(dl_item, TableItem):
+            caption_text = extractor.get_caption_text(clean=self.clean_text)
+            table_data = extractor.get_table_data()
+        elif isinstance(dl_item, PictureItem):
+            caption_text = extractor.get_caption_text(clean=self.clean_text)
+
         # Extract the slice data
-        slice_ = models.Slice(
+        return models.Slice(
             slice_num=extractor.slice_num,
             level=extractor.level,
             ref=extractor.get_ref(),
             parent_ref=extractor.get_parent_ref(),
             label=extractor.get_label(),
-            content_text=extractor.get_content_text(),
-            caption_text=extractor.get_caption_text(),
-            table_data=extractor.get_table_data(),
-            positions=[],
+            content_text=content_text,
+            caption_text=caption_text,
+            table_data=table_data,
+            positions=[
+                self.position_model_adapter.get_model(position_extractor)
+                for position_extractor in extractor.get_positions()
+            ],
             screenshot=None,
         )
 
-        # Extract the slice screenshot if requested
-        if self.extract_screenshot is not None and (screenshot := extractor.get_screenshot()):
-            slice_.screenshot = self.extract_model_adapter.get_model(screenshot)
-
-        # Extract the positions of the slice
-        for position_extractor in extractor.get_positions():
-            slice_.positions.append(
-                self.position_model_adapter.get_model(position_extractor)
-            )
-
-        return slice_
-
 
 class SlicePositionModelAdapter:
     """
@@ -146,12 +185,13 @@ class SlicePositionModelAdapter:
         Returns:
             The slice position model with data extracted from the document.
         """
+        top, right, bottom, left = extractor.get_bbox(self.bbox_precision)
         return models.Position(
             page_num=extractor.get_page_num(),
-            top=extractor.get_top(self.bbox_precision),
-            right=extractor.get_right(self.bbox_precision),
-            bottom=extractor.get_bottom(self.bbox_precision),
-            left=extractor.get_left(self.bbox_precision),
+            top=top,
+            right=right,
+            bottom=bottom,
+            left=left,
             coord_origin=extractor.get_coord_origin(),
         )
 
@@ -165,7 +205,8 @@ class ImageModelAdapter:
             self,
             *,
             image_format: models.ImageFormat = models.ImageFormat.WEBP,
-            image_quality: int = 80
+            image_quality: int = 80,
+            executor: Executor | None = None
     ):
         """
         Initialize the ImageModelAdapter.
@@ -173,9 +214,11 @@ class ImageModelAdapter:
         Args:
             image_format: The format of the image.
             image_quality: The quality of the image.
+            executor: The executor to encode batches of images with (default: a thread pool per batch).
         """
         self.image_format = image_format
         self.image_quality = image_quality
+        self.executor = executor
 
     def get_model(self, extractor: ImageExtractor) -> models.Image:
         """
@@ -187,23 +230,43 @@ class ImageModelAdapter:
         Returns:
             The image model with data extracted from the document.
         """
-        return models.Image(
-            data=self._encode_to_base64(extractor.get_data()),
-            width=extractor.get_width(),
-            height=extractor.get_height(),
-            content_type=f"image/{self.image_format.value}",
+        return self._get_model(extractor, extractor.get_data(self.image_format, self.image_quality))
+
+    def get_models(self, extractors: list[ImageExtractor]) -> list[models.Image]:
+        """
+        Returns the models of several images, encoded in a single batch.
+
+        Args:
+            extractors: The image extractor objects.
+
+        Returns:
+            The image models with data extracted from the document, in the same order as the extractors.
+        """
+        images_data = ImageExtractor.encode_many(
+            [extractor.pil_image for extractor in extractors],
+            self.image_format,
+            self.image_quality,
+            self.executor
         )
+        return [
+            self._get_model(extractor, image_data)
+            for extractor, image_data in zip(extractors, images_data)
+        ]
 
-    @staticmethod
-    def _encode_to_base64(data: bytes) -> str:
+    def _get_model(self, extractor: ImageExtractor, image_data: bytes) -> models.Image:
         """
-        Encode bytes to a base64 string.
+        Returns the model of an image from its encoded data.
 
         Args:
-            data (bytes): The bytes to encode.
+            extractor: The image extractor object.
+            image_data: The encoded image data.
 
         Returns:
-            str: The base64 encoded string.
+            The image model.
         """
-        # noinspection PyTypeChecker
-        return base64.b64encode(data).decode('ascii')
+        return models.Image(
+            data=encode_to_base64(image_data),
+            width=extractor.get_width(),
+            height=extractor.get_height(),
+            content_type=f"image/{self.image_format.value}",
+        )
@@ -0,0 +1,28 @@
+#  Copyright (c) 2025 Joan Fabrégat <j@fabreg.at>
+#  Permission is hereby granted, free of charge, to any person
+#  obtaining a copy of this software and associated documentation
+#  files (the "Software"), to deal in the Software without
+#  restriction, subject to the conditions in the full MIT License.
+#  The Software is provided "as is", without warranty of any kind.
+
+import re
+
+# Runs of PDF glyph tags, spaces and tabs, each replaced by a single space
+_CLEANUP_PATTERN = re.compile(r'(?i)(?:glyph<(?:c=\d+,font=/[A-Z0-9]+\+[A-Za-z0-9-]+|\d+)>|[ \t])+')
+_cleanup = _CLEANUP_PATTERN.sub
+
+
+def clean_pdf_glyphs(text: str) -> str:
+    """
+    Remove PDF tags from the text.
+
+    Args:
+        text: The text to clean.
+
+    Returns:
+        The cleaned text without PDF tags.
+    """
+    # Most texts have neither glyph tags nor runs of spaces or tabs to collapse
+    if '<' not in text and '\t' not in text and '  ' not in text:
+        return text.strip()
+    return _cleanup(' ', text).strip()